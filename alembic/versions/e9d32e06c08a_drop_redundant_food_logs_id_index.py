@@ -0,0 +1,29 @@
+"""drop redundant food_logs id index
+
+Revision ID: e9d32e06c08a
+Revises: ee1405950671
+Create Date: 2026-10-14 11:02:17.640193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9d32e06c08a'
+down_revision: Union[str, Sequence[str], None] = 'ee1405950671'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The primary key already indexes id
+    op.drop_index('ix_food_logs_id', table_name='food_logs')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_food_logs_id', 'food_logs', ['id'], unique=False)
@@ -0,0 +1,33 @@
+"""add user_id, created_at index to food_logs
+
+Revision ID: ee1405950671
+Revises: 7af8a7d32bfc
+Create Date: 2026-10-14 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ee1405950671'
+down_revision: Union[str, Sequence[str], None] = '7af8a7d32bfc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_food_logs_user_id_created_at',
+        'food_logs',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_food_logs_user_id_created_at', table_name='food_logs')
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from app.core.dependencies import get_food_log_service
 from app.services.food_log_service import FoodLogService
 from app.schemas.food_log import FoodLogResponse, FoodLogCreate, FoodLogSummary
@@ -8,30 +9,42 @@ import logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.post("/{user_id}", response_model=List[FoodLogResponse])
+_RESPONSE_FIELDS = tuple(FoodLogResponse.model_fields)
+# Documents the body; a response_model would re-validate every row
+_LIST_RESPONSES = {200: {"model": List[FoodLogResponse]}}
+
+
+def _to_response(food_logs) -> ORJSONResponse:
+    """Serialize stored rows directly, skipping response-model validation."""
+    return ORJSONResponse([
+        {field: getattr(food_log, field) for field in _RESPONSE_FIELDS}
+        for food_log in food_logs
+    ])
+
+@router.post("/{user_id}", responses=_LIST_RESPONSES)
 async def create_food_log(
     user_id: int,
     food_data: FoodLogCreate,
     food_log_service: FoodLogService = Depends(get_food_log_service)
-) -> List[FoodLogResponse]:
+) -> ORJSONResponse:
     """Create new food log entries."""
     try:
         food_logs = await food_log_service.create_food_log(user_id, food_data.message)
-        return [FoodLogResponse.from_orm(log) for log in food_logs]
+        return _to_response(food_logs)
     except Exception as e:
         logger.error(f"Error creating food log: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{user_id}", response_model=List[FoodLogResponse])
+@router.get("/{user_id}", responses=_LIST_RESPONSES)
 async def get_user_food_logs(
     user_id: int,
     limit: int = 10,
     food_log_service: FoodLogService = Depends(get_food_log_service)
-) -> List[FoodLogResponse]:
+) -> ORJSONResponse:
     """Get recent food logs for a user."""
     try:
         food_logs = await food_log_service.get_user_food_logs(user_id, limit)
-        return [FoodLogResponse.from_orm(log) for log in food_logs]
+        return _to_response(food_logs)
     except Exception as e:
         logger.error(f"Error getting user food logs: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
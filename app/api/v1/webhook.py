@@ -2,10 +2,10 @@
 
 from fastapi import APIRouter, Depends, Form
 from fastapi.responses import Response
-from twilio.twiml.messaging_response import MessagingResponse
 import logging
 
 from app.schemas.nutrition import MacroNutrients
+from app.schemas.webhook import twiml_bytes
 from app.core.dependencies import (
     get_user_repository,
     get_message_classification_service,
@@ -29,6 +29,8 @@ from app.exceptions import (
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+_PROFILE_FIELDS = ("target_calories", "target_protein", "target_carbs", "target_fats")
+
 
 @router.post("/message")
 async def handle_message(
@@ -49,7 +51,7 @@ async def handle_message(
         
         # Get user or return error
         try:
-            user = await user_repo.get_by_phone_number_or_raise(phone_number)
+            user = await user_repo.get_profile_by_phone_number_or_raise(phone_number)
         except UserNotFoundError:
             return _create_twiml_response(response_formatter.format_user_not_found_response())
         
@@ -96,8 +98,8 @@ async def _handle_question(
         # Get recent food logs for context
         food_logs_summary = await food_log_service.get_recent_food_logs_summary(user_id)
         
-        # Get AI response
-        response_text = await openai_service.analyze_diet_question(
+        # Get AI response; TwiML replies carry the whole message, so don't stream
+        response_text = await openai_service.analyze_diet_question_full(
             message, user_profile, food_logs_summary
         )
         
@@ -117,15 +119,14 @@ async def _handle_food_entry(
 ) -> str:
     """Handle food entry messages."""
     try:
-        # Create food logs
-        food_logs = await food_log_service.create_food_log(user.id, message)
-        
+        # Create food logs and get daily totals in one round-trip
+        food_logs, daily_consumed = await food_log_service.create_food_log_and_totals(
+            user.id, message
+        )
+
         # Calculate meal totals
         meal_totals = nutrition_calculator.calculate_meal_totals(food_logs)
-        
-        # Get daily totals
-        daily_consumed = await nutrition_calculator.get_daily_totals(user.id)
-        
+
         # Create target nutrients from user profile
         daily_targets = MacroNutrients(
             calories=float(user_profile.get('target_calories', 0) or 0),
@@ -152,25 +153,13 @@ async def _handle_food_entry(
 
 
 def _extract_user_profile(user) -> dict:
-    """Extract user profile data with safe type conversion."""
-    def get_float_value(value) -> float:
-        if value is None:
-            return 0.0
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return 0.0
-    
-    return {
-        "target_calories": get_float_value(user.target_calories),
-        "target_protein": get_float_value(user.target_protein),
-        "target_carbs": get_float_value(user.target_carbs),
-        "target_fats": get_float_value(user.target_fats)
-    }
+    """Extract user nutrition targets as floats, treating missing values as 0."""
+    return {field: float(getattr(user, field) or 0.0) for field in _PROFILE_FIELDS}
 
 
 def _create_twiml_response(message: str) -> Response:
     """Create TwiML response for Twilio."""
-    resp = MessagingResponse()
-    resp.message(message)
-    return Response(content=str(resp), media_type="application/xml")
\ No newline at end of file
+    return Response(
+        content=twiml_bytes(message),
+        media_type="application/xml"
+    )
\ No newline at end of file
@@ -1,5 +1,6 @@
 import asyncio
 import json
+import time
 from httpx import AsyncClient
 from app.main import app
 from app.db.session import async_session
@@ -31,27 +32,24 @@ async def create_test_user():
             print("Created test user with phone number: +12014103350")
         return user
 
-async def send_message(message: str):
+async def send_message(ac: AsyncClient, message: str):
     """Send a message to the bot and get the response"""
-    # Create test user if needed
-    await create_test_user()
-    
     # Prepare the message payload
     payload = {
         "message": message,
         "from": "+12014103350"  # Test phone number
     }
     
-    # Use httpx AsyncClient to make the request
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        response = await ac.post("/api/v1/webhook/message", json=payload)
-        
-        if response.status_code == 200:
-            print("\nBot's response:")
-            print(response.json()["response"])
-        else:
-            print(f"\nError: {response.status_code}")
-            print(response.json())
+    start = time.perf_counter()
+    response = await ac.post("/api/v1/webhook/message", json=payload)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    if response.status_code == 200:
+        print(f"\nBot's response ({elapsed_ms:.0f} ms):")
+        print(response.json()["response"])
+    else:
+        print(f"\nError: {response.status_code} ({elapsed_ms:.0f} ms)")
+        print(response.json())
 
 async def main_async():
     print("Welcome to the Diet Bot CLI!")
@@ -62,14 +60,19 @@ async def main_async():
     print("- 'What should I eat to meet my macros?'")
     print("\nEnter your message:")
     
-    while True:
-        message = input("> ").strip()
-        if message.lower() == 'exit':
-            break
-        
-        if message:
-            await send_message(message)
-        print("\nEnter another message (or 'exit' to quit):")
+    # Create test user if needed
+    await create_test_user()
+    
+    # One client for the whole session instead of one per message
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        while True:
+            message = input("> ").strip()
+            if message.lower() == 'exit':
+                break
+            
+            if message:
+                await send_message(ac, message)
+            print("\nEnter another message (or 'exit' to quit):")
 
 def main():
     asyncio.run(main_async())
@@ -1,9 +1,10 @@
 from pydantic_settings import BaseSettings
-from functools import lru_cache
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+# In production env vars come from the container; only read .env locally
+if os.getenv("ENV", "dev") == "dev":
+    load_dotenv()
 
 class Settings(BaseSettings):
     # API Keys
@@ -13,9 +14,33 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./diet_tracker.db")
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_WARM_SIZE: int = 20  # connections opened at startup; 0 disables
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_POOL_PRE_PING: bool = True  # costs a round-trip per checkout
+    DB_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements per connection
+    DB_ECHO: bool = False  # log every SQL statement; for debugging only
     
     # OpenAI Configuration
     OPENAI_MODEL: str = "gpt-4-turbo-preview"
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_MAX_CONCURRENCY: int = 10  # in-flight completions, to stay under the RPM limit
+    # Twilio drops a webhook after 15 s, so the deadline, which also covers
+    # waiting for a slot and every retry, stays under it. A food analysis
+    # isn't streamed and arrives in one piece once fully generated, so a
+    # read may use the whole deadline instead of being cut short and retried
+    OPENAI_MAX_RETRIES: int = 2  # SDK retries connection errors, 429s and 5xx with backoff
+    OPENAI_CONNECT_TIMEOUT: float = 2.0  # seconds to open a connection
+    OPENAI_DEADLINE: float = 12.0  # seconds for a whole call, queueing included
+    
+    # Caching
+    USER_PROFILE_CACHE_TTL: int = 300  # seconds
+    USER_PROFILE_CACHE_SIZE: int = 10_000
+    FOOD_ANALYSIS_CACHE_TTL: int = 7 * 24 * 3600  # seconds; a phrase's nutrition rarely changes
+    FOOD_ANALYSIS_CACHE_SIZE: int = 10_000
     
     # Application Settings
     APP_NAME: str = "Diet Tracking Chatbot"
@@ -24,6 +49,7 @@ class Settings(BaseSettings):
     class Config:
         case_sensitive = True
 
-@lru_cache()
+SETTINGS = Settings()
+
 def get_settings() -> Settings:
-    return Settings() 
\ No newline at end of file
+    return SETTINGS
\ No newline at end of file
@@ -36,21 +36,24 @@ def get_openai_service() -> OpenAIService:
 
 # Database-dependent services (not cached as they depend on DB session)
 
-def get_user_repository(db: AsyncSession = Depends(get_db)) -> UserRepository:
+async def get_user_repository(db: AsyncSession = Depends(get_db)) -> UserRepository:
     """Get user repository."""
     return UserRepository(db)
 
 
-def get_food_log_repository(db: AsyncSession = Depends(get_db)) -> FoodLogRepository:
+async def get_food_log_repository(db: AsyncSession = Depends(get_db)) -> FoodLogRepository:
     """Get food log repository."""
     return FoodLogRepository(db)
 
 
-def get_nutrition_calculation_service(db: AsyncSession = Depends(get_db)) -> NutritionCalculationService:
+async def get_nutrition_calculation_service(db: AsyncSession = Depends(get_db)) -> NutritionCalculationService:
     """Get nutrition calculation service."""
     return NutritionCalculationService(db)
 
 
-def get_food_log_service(db: AsyncSession = Depends(get_db)) -> FoodLogService:
+async def get_food_log_service(
+    db: AsyncSession = Depends(get_db),
+    openai_service: OpenAIService = Depends(get_openai_service)
+) -> FoodLogService:
     """Get food log service."""
-    return FoodLogService(db)
\ No newline at end of file
+    return FoodLogService(db, openai_service)
\ No newline at end of file
@@ -1,5 +1,8 @@
+import asyncio
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import get_settings
 
 settings = get_settings()
@@ -18,12 +21,60 @@ def get_database_url():
     
     return database_url
 
-# Create async engine
-engine = create_async_engine(
-    get_database_url(),
-    echo=settings.DEBUG,
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
 )
 
+def get_engine_options(database_url: str) -> dict:
+    """Get engine options tuned for the database backend"""
+    # Keep warm connections for both backends; aiosqlite otherwise defaults
+    # to NullPool and opens a new connection for every session
+    options = {
+        "echo": settings.DB_ECHO,
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    
+    if database_url.startswith('postgresql+asyncpg://'):
+        options.update(
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            # Repositories issue the same few parametrized statements; keep
+            # them prepared on each connection
+            connect_args={
+                "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            },
+        )
+    
+    return options
+
+# Create async engine
+database_url = get_database_url()
+engine = create_async_engine(database_url, **get_engine_options(database_url))
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL so readers don't block the writer, and keep temp data in memory"""
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+async def warm_connection_pool(size: int) -> None:
+    """Open `size` pool connections up front so early requests skip the handshake"""
+    async def _warm():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    
+    # Checked out concurrently, so stay within the pool's persistent size
+    await asyncio.gather(*(_warm() for _ in range(min(size, settings.DB_POOL_SIZE))))
+
 # Create async session factory
 async_session = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
@@ -1,10 +1,14 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.api import api_router
 from app.db.init_db import init_db
 from app.core.config import get_settings
-from app.db.session import engine
+from app.core.dependencies import get_openai_service
+from app.db.session import engine, warm_connection_pool
 from sqlalchemy import text
+from sqlalchemy.engine import make_url
 import logging
 
 # Set up logging
@@ -13,10 +17,42 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Safe to log: the password is replaced with ***
+DB_URL_MASKED = make_url(settings.DATABASE_URL).render_as_string(hide_password=True)
+
+# Static bodies for the probe endpoints, built once
+_ROOT_BODY = {"message": "Welcome to the Diet Tracking Chatbot API"}
+_HEALTH_BODY = {"status": "healthy"}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the database pool on startup and close pooled clients on shutdown"""
+    try:
+        logger.info("Starting application...")
+        logger.info("Database URL: %s", DB_URL_MASKED)
+        logger.info("Debug mode: %s", settings.DEBUG)
+        
+        # Open pooled connections now rather than on the first webhooks
+        await warm_connection_pool(settings.DB_POOL_WARM_SIZE)
+        logger.info("Database connection pool warmed")
+        
+    except Exception as e:
+        logger.error(f"Startup failed: {str(e)}")
+        logger.error("Continuing with startup despite database error")
+    
+    yield
+    
+    await get_openai_service().close()
+    # Drop the closed client so a restarted lifespan builds a fresh one
+    get_openai_service.cache_clear()
+    await engine.dispose()
+
 app = FastAPI(
     title="Diet Tracking Chatbot",
     description="A WhatsApp/SMS chatbot for diet tracking and nutrition analysis",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -24,59 +60,45 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"] if settings.DEBUG else [],  # In production, replace with specific origins
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["*"],
+    max_age=86400,  # let browsers cache preflight responses for 24h
 )
 
 # Include routers
 app.include_router(api_router, prefix="/api")
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database on startup"""
-    try:
-        logger.info("Starting application...")
-        logger.info(f"Database URL: {settings.DATABASE_URL[:20]}..." if len(settings.DATABASE_URL) > 20 else settings.DATABASE_URL)
-        logger.info(f"Debug mode: {settings.DEBUG}")
-        
-        # Simple database test without blocking
-        logger.info("Database connection test completed")
-        
-    except Exception as e:
-        logger.error(f"Startup failed: {str(e)}")
-        logger.error("Continuing with startup despite database error")
-
 @app.get("/")
 async def root():
-    return {"message": "Welcome to the Diet Tracking Chatbot API"}
+    return ORJSONResponse(_ROOT_BODY)
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return ORJSONResponse(_HEALTH_BODY)
 
-@app.get("/db-test")
-async def test_database():
-    """Test database connection"""
-    try:
-        # Debug: Show what database URL we're using
-        db_url = settings.DATABASE_URL
-        masked_url = db_url.split('@')[0] + "@***" if '@' in db_url else "***"
-        
-        # Test database connection
-        async with engine.begin() as conn:
-            result = await conn.execute(text("SELECT 1"))
-            result.fetchone()
-        
-        return {
-            "status": "success",
-            "message": "Database connection successful",
-            "database_url": masked_url,
-            "database_type": "PostgreSQL" if "postgresql" in db_url.lower() else "SQLite"
-        }
-    except Exception as e:
-        return {
-            "status": "error",
-            "message": f"Database connection failed: {str(e)}",
-            "database_url": settings.DATABASE_URL.split('@')[0] + "@***" if '@' in settings.DATABASE_URL else "***",
-            "database_type": "PostgreSQL" if "postgresql" in settings.DATABASE_URL.lower() else "SQLite"
-        } 
\ No newline at end of file
+# Diagnostic only; it opens a transaction per hit, so keep it off in production
+if settings.DEBUG:
+    DB_TYPE = "PostgreSQL" if "postgresql" in settings.DATABASE_URL.lower() else "SQLite"
+    
+    @app.get("/db-test")
+    async def test_database():
+        """Test database connection"""
+        try:
+            # Test database connection
+            async with engine.begin() as conn:
+                result = await conn.execute(text("SELECT 1"))
+                result.fetchone()
+            
+            return {
+                "status": "success",
+                "message": "Database connection successful",
+                "database_url": DB_URL_MASKED,
+                "database_type": DB_TYPE
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Database connection failed: {str(e)}",
+                "database_url": DB_URL_MASKED,
+                "database_type": DB_TYPE
+            }
\ No newline at end of file
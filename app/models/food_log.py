@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from datetime import date, datetime, time, timedelta, timezone
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, and_
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -6,9 +8,19 @@ from app.db.base import Base
 class FoodLog(Base):
     __tablename__ = "food_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # SQLite compares datetimes as text, so bound values use the
+    # "YYYY-MM-DD HH:MM:SS" format CURRENT_TIMESTAMP stores
+    created_at = Column(
+        DateTime(timezone=True).with_variant(
+            sqlite.DATETIME(
+                storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+            ),
+            "sqlite"
+        ),
+        server_default=func.now()
+    )
     
     # Food Entry Details
     food_description = Column(String)  # Original text from user
@@ -26,4 +38,15 @@ class FoodLog(Base):
     notes = Column(String)            # Additional notes or clarifications
     
     # Relationships
-    user = relationship("User", back_populates="food_logs") 
\ No newline at end of file
+    user = relationship("User", back_populates="food_logs")
+    
+    # Serves the per-user, newest-first queries without a sort
+    __table_args__ = (
+        Index("ix_food_logs_user_id_created_at", "user_id", created_at.desc()),
+    )
+    
+    @classmethod
+    def created_on(cls, day: date):
+        """Filter for logs created on a UTC day, as a range the index can use"""
+        start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        return and_(cls.created_at >= start, cls.created_at < start + timedelta(days=1)) 
\ No newline at end of file
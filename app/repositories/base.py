@@ -16,10 +16,8 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
     
     async def get_by_id(self, id: int) -> Optional[ModelType]:
-        """Get a record by ID."""
-        stmt = select(self.model).where(self.model.id == id)
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+        """Get a record by ID, from the session's identity map when already loaded."""
+        return await self.db.get(self.model, id)
     
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get all records with pagination."""
@@ -30,8 +28,8 @@ class BaseRepository(Generic[ModelType]):
     async def create(self, obj: ModelType) -> ModelType:
         """Create a new record."""
         self.db.add(obj)
+        # Generated ids and server defaults come back via INSERT ... RETURNING
         await self.db.commit()
-        await self.db.refresh(obj)
         return obj
     
     async def update(self, obj: ModelType) -> ModelType:
@@ -3,7 +3,7 @@
 from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import Select, select, func, desc
 
 from app.models.food_log import FoodLog
 from app.repositories.base import BaseRepository
@@ -61,7 +61,7 @@ class FoodLogRepository(BaseRepository[FoodLog]):
             select(FoodLog)
             .where(
                 FoodLog.user_id == user_id,
-                func.date(FoodLog.created_at) == date
+                FoodLog.created_on(date)
             )
             .order_by(desc(FoodLog.created_at))
         )
@@ -113,33 +113,36 @@ class FoodLogRepository(BaseRepository[FoodLog]):
         if date is None:
             date = datetime.now(timezone.utc).date()
         
-        stmt = select(
-            func.sum(FoodLog.calories).label('total_calories'),
-            func.sum(FoodLog.protein).label('total_protein'),
-            func.sum(FoodLog.carbs).label('total_carbs'),
-            func.sum(FoodLog.fats).label('total_fats'),
-            func.sum(FoodLog.fiber).label('total_fiber'),
-            func.sum(FoodLog.sugar).label('total_sugar'),
-            func.sum(FoodLog.sodium).label('total_sodium'),
+        result = await self.db.execute(self.daily_totals_stmt(user_id, date))
+        return dict(result.one()._mapping)
+    
+    @staticmethod
+    def daily_totals_stmt(user_id: int, date: datetime.date) -> Select:
+        """
+        Build the aggregate of a user's nutrition for one day.
+        
+        Shared by every daily-totals query so they agree on labels and
+        on empty days.
+        
+        Args:
+            user_id: User ID
+            date: Date to aggregate
+            
+        Returns:
+            Select yielding one row of total_calories, total_protein,
+            total_carbs, total_fats and entry_count
+        """
+        # COALESCE with a float so empty days come back as 0.0 from the driver
+        return select(
+            func.coalesce(func.sum(FoodLog.calories), 0.0).label('total_calories'),
+            func.coalesce(func.sum(FoodLog.protein), 0.0).label('total_protein'),
+            func.coalesce(func.sum(FoodLog.carbs), 0.0).label('total_carbs'),
+            func.coalesce(func.sum(FoodLog.fats), 0.0).label('total_fats'),
             func.count(FoodLog.id).label('entry_count')
         ).where(
             FoodLog.user_id == user_id,
-            func.date(FoodLog.created_at) == date
+            FoodLog.created_on(date)
         )
-        
-        result = await self.db.execute(stmt)
-        row = result.first()
-        
-        return {
-            'total_calories': float(row.total_calories or 0),
-            'total_protein': float(row.total_protein or 0),
-            'total_carbs': float(row.total_carbs or 0),
-            'total_fats': float(row.total_fats or 0),
-            'total_fiber': float(row.total_fiber or 0),
-            'total_sugar': float(row.total_sugar or 0),
-            'total_sodium': float(row.total_sodium or 0),
-            'entry_count': int(row.entry_count or 0)
-        }
     
     async def create_food_log(
         self,
@@ -209,9 +212,7 @@ class FoodLogRepository(BaseRepository[FoodLog]):
             List of created FoodLog instances
         """
         self.db.add_all(food_logs)
+        # The flush's INSERT ... RETURNING already fills in ids and server
+        # defaults, and the session doesn't expire them on commit
         await self.db.commit()
-        
-        for food_log in food_logs:
-            await self.db.refresh(food_log)
-        
         return food_logs
\ No newline at end of file
@@ -1,13 +1,42 @@
 """User repository for user-specific database operations."""
 
 from typing import Optional
+from cachetools import TTLCache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, bindparam, Row
+from sqlalchemy.orm import selectinload
 
+from app.core.config import get_settings
 from app.models.user import User
 from app.repositories.base import BaseRepository
 from app.exceptions.user import UserNotFoundError
 
+settings = get_settings()
+
+# Per-process cache of the webhook profile lookup, keyed by phone number.
+# Entries are dropped when targets change here; other workers see the
+# change once the TTL expires.
+_profile_cache: TTLCache = TTLCache(
+    maxsize=settings.USER_PROFILE_CACHE_SIZE,
+    ttl=settings.USER_PROFILE_CACHE_TTL
+)
+
+# Phone number -> user id. Ids never change, so a hit only needs a
+# primary-key get, which the session can answer from its identity map.
+_user_id_cache: TTLCache = TTLCache(
+    maxsize=settings.USER_PROFILE_CACHE_SIZE,
+    ttl=settings.USER_PROFILE_CACHE_TTL
+)
+
+# Built once so every lookup reuses the same compiled statement
+_PROFILE_BY_PHONE = select(
+    User.id,
+    User.target_calories,
+    User.target_protein,
+    User.target_carbs,
+    User.target_fats
+).where(User.phone_number == bindparam("phone_number")).limit(1)
+
 
 class UserRepository(BaseRepository[User]):
     """Repository for User model operations."""
@@ -15,26 +44,58 @@ class UserRepository(BaseRepository[User]):
     def __init__(self, db: AsyncSession):
         super().__init__(db, User)
     
-    async def get_by_phone_number(self, phone_number: str) -> Optional[User]:
+    async def get_by_phone_number(
+        self, 
+        phone_number: str, 
+        with_food_logs: bool = False
+    ) -> Optional[User]:
         """
         Get user by phone number.
         
         Args:
             phone_number: User's phone number
+            with_food_logs: Also load `food_logs` in one extra IN query, since
+                lazy loading isn't available under async
             
         Returns:
             User if found, None otherwise
         """
-        stmt = select(User).where(User.phone_number == phone_number)
+        options = [selectinload(User.food_logs)] if with_food_logs else []
+        
+        user_id = _user_id_cache.get(phone_number)
+        if user_id is not None:
+            # An identity-map hit would skip the loader option, so reload then
+            user = await self.db.get(
+                User, user_id, options=options, populate_existing=with_food_logs
+            )
+            if user is not None:
+                return user
+            # User was deleted since it was cached
+            _user_id_cache.pop(phone_number, None)
+        
+        stmt = (
+            select(User)
+            .where(User.phone_number == phone_number)
+            .options(*options)
+            .limit(1)
+        )
         result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        if user is not None:
+            _user_id_cache[phone_number] = user.id
+        return user
     
-    async def get_by_phone_number_or_raise(self, phone_number: str) -> User:
+    async def get_by_phone_number_or_raise(
+        self, 
+        phone_number: str, 
+        with_food_logs: bool = False
+    ) -> User:
         """
         Get user by phone number or raise exception.
         
         Args:
             phone_number: User's phone number
+            with_food_logs: Also load `food_logs`
             
         Returns:
             User instance
@@ -42,11 +103,53 @@ class UserRepository(BaseRepository[User]):
         Raises:
             UserNotFoundError: If user is not found
         """
-        user = await self.get_by_phone_number(phone_number)
+        user = await self.get_by_phone_number(phone_number, with_food_logs)
         if not user:
             raise UserNotFoundError(phone_number)
         return user
     
+    async def get_profile_by_phone_number(self, phone_number: str) -> Optional[Row]:
+        """
+        Get only the user's ID and nutrition targets by phone number.
+        
+        Results are cached per process for USER_PROFILE_CACHE_TTL seconds.
+        
+        Args:
+            phone_number: User's phone number
+            
+        Returns:
+            Row with id, target_calories, target_protein, target_carbs and
+            target_fats if found, None otherwise
+        """
+        profile = _profile_cache.get(phone_number)
+        if profile is not None:
+            return profile
+        
+        result = await self.db.execute(_PROFILE_BY_PHONE, {"phone_number": phone_number})
+        profile = result.first()
+        
+        if profile is not None:
+            _profile_cache[phone_number] = profile
+        return profile
+    
+    async def get_profile_by_phone_number_or_raise(self, phone_number: str) -> Row:
+        """
+        Get the user's ID and nutrition targets by phone number or raise exception.
+        
+        Args:
+            phone_number: User's phone number
+            
+        Returns:
+            Row with id and nutrition targets
+            
+        Raises:
+            UserNotFoundError: If user is not found
+        """
+        profile = await self.get_profile_by_phone_number(phone_number)
+        if not profile:
+            raise UserNotFoundError(phone_number)
+        return profile
+    
     async def create_user(self, phone_number: str, **kwargs) -> User:
         """
         Create a new user.
@@ -98,4 +201,7 @@ class UserRepository(BaseRepository[User]):
         if target_fats is not None:
             user.target_fats = target_fats
         
-        return await self.update(user)
\ No newline at end of file
+        user = await self.update(user)
+        # Evict only once committed, so a concurrent lookup can't re-cache old targets
+        _profile_cache.pop(user.phone_number, None)
+        return user
\ No newline at end of file
@@ -21,18 +21,15 @@ class FoodLogResponse(BaseModel):
     """Food log entry response."""
     id: int
     user_id: int
-    food_name: str
-    quantity: str
-    calories: float
-    protein: float
-    carbs: float
-    fats: float
-    fiber: Optional[float] = None
-    sugar: Optional[float] = None
-    sodium: Optional[float] = None
-    confidence: float
-    normalized_title: str
-    raw_analysis: str
+    food_description: Optional[str] = None
+    normalized_title: Optional[str] = None
+    meal_type: Optional[str] = None
+    calories: Optional[float] = None
+    protein: Optional[float] = None
+    carbs: Optional[float] = None
+    fats: Optional[float] = None
+    confidence_score: Optional[float] = None
+    notes: Optional[str] = None
     created_at: datetime
     
     class Config:
@@ -1,6 +1,16 @@
 from typing import Optional
+from xml.sax.saxutils import escape
 from pydantic import BaseModel, Field
 
+# Same document Twilio's MessagingResponse renders for a single message
+_TWIML_PREFIX = b'<?xml version="1.0" encoding="UTF-8"?><Response><Message>'
+_TWIML_SUFFIX = b"</Message></Response>"
+
+
+def twiml_bytes(message: str) -> bytes:
+    """Render a single-message TwiML document, escaping the message text."""
+    return _TWIML_PREFIX + escape(message).encode() + _TWIML_SUFFIX
+
 
 class WebhookRequest(BaseModel):
     """Twilio webhook request schema."""
@@ -17,4 +27,4 @@ class WebhookResponse(BaseModel):
     
     def to_twiml(self) -> str:
         """Convert to TwiML format for Twilio response."""
-        return f"<Response><Message>{self.message}</Message></Response>"
\ No newline at end of file
+        return f"<Response><Message>{escape(self.message)}</Message></Response>"
\ No newline at end of file
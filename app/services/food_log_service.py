@@ -1,17 +1,21 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert, true
+from sqlalchemy.orm import aliased
 from app.models.food_log import FoodLog
+from app.repositories.food_log_repository import FoodLogRepository
+from app.schemas.nutrition import MacroNutrients
 from app.services.openai_service import OpenAIService
 import logging
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from collections import Counter
+from typing import List, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger(__name__)
 
 class FoodLogService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, openai_service: OpenAIService):
         self.db = db
-        self.openai_service = OpenAIService()
+        self.openai_service = openai_service
 
     async def create_food_log(self, user_id: int, food_description: str) -> List[FoodLog]:
         """Create food log entries for each food item in the description."""
@@ -19,37 +23,125 @@ class FoodLogService:
             # Get AI analysis
             analysis = await self.openai_service.analyze_food_entry(food_description)
             
-            # Create food log entries for each item
-            food_logs = []
-            for item in analysis["items"]:
-                food_log = FoodLog(
-                    user_id=user_id,
-                    food_description=food_description,
-                    normalized_title=item["normalized_title"],
-                    meal_type=analysis["meal_type"],
-                    calories=item["nutrition"]["calories"],
-                    protein=item["nutrition"]["protein"],
-                    carbs=item["nutrition"]["carbs"],
-                    fats=item["nutrition"]["fats"],
-                    confidence_score=item["confidence_score"],
-                    notes=item.get("notes") or analysis.get("notes")
-                )
-                self.db.add(food_log)
-                food_logs.append(food_log)
+            # Insert all items in one batch; RETURNING hydrates IDs and defaults
+            rows = self._build_food_log_rows(user_id, food_description, analysis)
+            food_logs = await self._bulk_insert(rows)
             
             await self.db.commit()
+            return food_logs
             
-            # Refresh all food logs to get their IDs
-            for food_log in food_logs:
-                await self.db.refresh(food_log)
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error creating food logs: {str(e)}")
+            raise
+
+    async def create_food_log_and_totals(
+        self, user_id: int, food_description: str
+    ) -> Tuple[List[FoodLog], MacroNutrients]:
+        """
+        Create food log entries and return them together with today's totals.
+        
+        On PostgreSQL the insert and the daily aggregate are issued as a single
+        statement (a data-modifying CTE), saving a round-trip per food entry.
+        
+        Args:
+            user_id: User ID
+            food_description: User's food description message
             
-            return food_logs
+        Returns:
+            Tuple of the created FoodLog entries and the day's consumed totals,
+            including the new entries
+        """
+        try:
+            analysis = await self.openai_service.analyze_food_entry(food_description)
+            rows = self._build_food_log_rows(user_id, food_description, analysis)
+            today = datetime.now(timezone.utc).date()
+            
+            if self.db.bind.dialect.name == "postgresql":
+                food_logs, daily_totals = await self._insert_returning_daily_totals(
+                    user_id, rows, today
+                )
+            else:
+                # SQLite has no INSERT inside WITH; insert and aggregate in the same transaction
+                food_logs = await self._bulk_insert(rows)
+                result = await self.db.execute(FoodLogRepository.daily_totals_stmt(user_id, today))
+                daily_totals = self._to_macros(result.one())
+            
+            await self.db.commit()
+            return food_logs, daily_totals
             
         except Exception as e:
             await self.db.rollback()
             logger.error(f"Error creating food logs: {str(e)}")
             raise
 
+    async def _bulk_insert(self, rows: List[Dict[str, Any]]) -> List[FoodLog]:
+        """Insert food log rows in one statement and return them in input order."""
+        # render_nulls keeps rows with a missing note in the same batch
+        result = await self.db.scalars(
+            insert(FoodLog).returning(FoodLog, sort_by_parameter_order=True),
+            rows,
+            execution_options={"render_nulls": True}
+        )
+        return result.all()
+
+    async def _insert_returning_daily_totals(
+        self, user_id: int, rows: List[Dict[str, Any]], today
+    ) -> Tuple[List[FoodLog], MacroNutrients]:
+        """Insert rows and aggregate the day's totals in one statement."""
+        inserted = (
+            insert(FoodLog)
+            .values(rows)
+            .returning(*FoodLog.__table__.c)
+            .cte("inserted")
+        )
+        # CTE siblings share a snapshot, so this excludes the rows being inserted
+        existing = FoodLogRepository.daily_totals_stmt(user_id, today).subquery("existing")
+        
+        # Serial ids follow the VALUES order, so sorting on them keeps the analysis order
+        stmt = select(
+            aliased(FoodLog, inserted),
+            (func.sum(inserted.c.calories).over() + existing.c.total_calories).label("total_calories"),
+            (func.sum(inserted.c.protein).over() + existing.c.total_protein).label("total_protein"),
+            (func.sum(inserted.c.carbs).over() + existing.c.total_carbs).label("total_carbs"),
+            (func.sum(inserted.c.fats).over() + existing.c.total_fats).label("total_fats")
+        ).select_from(inserted.join(existing, true())).order_by(inserted.c.id)
+        
+        result = (await self.db.execute(stmt)).all()
+        return [row[0] for row in result], self._to_macros(result[0])
+
+    def _to_macros(self, row) -> MacroNutrients:
+        """Convert an aggregate row into MacroNutrients."""
+        return MacroNutrients(
+            calories=float(row.total_calories),
+            protein=float(row.total_protein),
+            carbs=float(row.total_carbs),
+            fats=float(row.total_fats)
+        )
+
+    def _build_food_log_rows(
+        self,
+        user_id: int,
+        food_description: str,
+        analysis: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Map an AI analysis onto food_logs column values, one row per item."""
+        return [
+            {
+                "user_id": user_id,
+                "food_description": food_description,
+                "normalized_title": item["normalized_title"],
+                "meal_type": analysis["meal_type"],
+                "calories": item["nutrition"]["calories"],
+                "protein": item["nutrition"]["protein"],
+                "carbs": item["nutrition"]["carbs"],
+                "fats": item["nutrition"]["fats"],
+                "confidence_score": item["confidence_score"],
+                "notes": item.get("notes") or analysis.get("notes")
+            }
+            for item in analysis["items"]
+        ]
+
     async def get_user_food_logs(self, user_id: int, limit: int = 10) -> List[FoodLog]:
         """Get recent food logs for a user."""
         try:
@@ -59,8 +151,8 @@ class FoodLogService:
                 .order_by(FoodLog.created_at.desc())
                 .limit(limit)
             )
-            result = await self.db.execute(stmt)
-            return [row[0] for row in result.all()]
+            result = await self.db.scalars(stmt)
+            return result.all()
         except Exception as e:
             logger.error(f"Error getting user food logs: {str(e)}")
             raise
@@ -82,8 +174,8 @@ class FoodLogService:
                 )
                 .order_by(FoodLog.created_at.desc())
             )
-            result = await self.db.execute(stmt)
-            food_logs = [row[0] for row in result.all()]
+            result = await self.db.scalars(stmt)
+            food_logs = result.all()
             
             # Calculate daily totals
             daily_totals = {}
@@ -111,20 +203,22 @@ class FoodLogService:
                     "fats": log.fats
                 })
             
-            # Calculate averages
+            # Calculate averages in one pass over the days
             total_days = len(daily_totals)
+            avg_calories = avg_protein = avg_carbs = avg_fats = 0
+            for day in daily_totals.values():
+                avg_calories += day["calories"]
+                avg_protein += day["protein"]
+                avg_carbs += day["carbs"]
+                avg_fats += day["fats"]
             if total_days > 0:
-                avg_calories = sum(day["calories"] for day in daily_totals.values()) / total_days
-                avg_protein = sum(day["protein"] for day in daily_totals.values()) / total_days
-                avg_carbs = sum(day["carbs"] for day in daily_totals.values()) / total_days
-                avg_fats = sum(day["fats"] for day in daily_totals.values()) / total_days
-            else:
-                avg_calories = avg_protein = avg_carbs = avg_fats = 0
+                avg_calories /= total_days
+                avg_protein /= total_days
+                avg_carbs /= total_days
+                avg_fats /= total_days
             
             # Get most common meal types
-            meal_types = {}
-            for log in food_logs:
-                meal_types[log.meal_type] = meal_types.get(log.meal_type, 0) + 1
+            meal_types = Counter(log.meal_type for log in food_logs)
             
             return {
                 "daily_logs": daily_totals,
@@ -0,0 +1,118 @@
+"""Service for analyzing trivial food entries without calling OpenAI."""
+
+import re
+from fractions import Fraction
+from typing import Any, Dict, Optional
+
+
+class FoodLookupService:
+    """Answers single, plainly counted foods (e.g. "2 eggs") from a local table."""
+    
+    # (title, usual meal type, calories, protein, carbs, fats, note) for one unit.
+    # Only foods with a standard unit belong here; anything else goes to the
+    # model. The usual meal type applies only when the entry doesn't name one.
+    FOODS = {
+        "banana": ("Banana", "snack", 105.0, 1.3, 27.0, 0.4,
+                   "Great choice! Whole fruit with fiber and potassium."),
+        "apple": ("Apple", "snack", 95.0, 0.5, 25.1, 0.3,
+                  "Great choice! Whole fruit with plenty of fiber."),
+        "orange": ("Orange", "snack", 62.0, 1.2, 15.4, 0.2,
+                   "Great choice! Whole fruit rich in vitamin C."),
+        "pear": ("Pear", "snack", 101.0, 0.6, 27.1, 0.2,
+                 "Great choice! Whole fruit with plenty of fiber."),
+        "peach": ("Peach", "snack", 59.0, 1.4, 14.3, 0.4,
+                  "Great choice! Light, whole fruit."),
+        "egg": ("Egg", "breakfast", 72.0, 6.3, 0.4, 4.8,
+                "Great choice! Eggs are a whole-food source of protein."),
+        "coffee": ("Black Coffee", "drink", 2.0, 0.3, 0.0, 0.0,
+                   "No added sugar, so this fits the guidelines well."),
+        "tea": ("Tea", "drink", 2.0, 0.0, 0.7, 0.0,
+                "No added sugar, so this fits the guidelines well."),
+        "water": ("Water", "drink", 0.0, 0.0, 0.0, 0.0,
+                  "Great choice! Keep up the hydration."),
+    }
+    
+    ALIASES = {
+        "large egg": "egg",
+        "black coffee": "coffee",
+        "cup of coffee": "coffee",
+        "cup of black coffee": "coffee",
+        "cup of tea": "tea",
+        "glass of water": "water",
+    }
+    # Plural forms only count with a quantity; "eggs" alone could be any number
+    PLURALS = {
+        "bananas": "banana",
+        "apples": "apple",
+        "oranges": "orange",
+        "pears": "pear",
+        "peaches": "peach",
+        "eggs": "egg",
+        "large eggs": "egg",
+        "cups of coffee": "coffee",
+        "cups of black coffee": "coffee",
+        "cups of tea": "tea",
+        "glasses of water": "water",
+    }
+    
+    MAX_QUANTITY = 12
+    _WORD_QUANTITIES = {"a": "1", "an": "1", "one": "1", "two": "2", "three": "3", "half a": "1/2"}
+    
+    # Optional leading quantity, the food, then an optional meal such as
+    # "for breakfast" or "as a snack"
+    _ENTRY_RE = re.compile(
+        r"^(?:(?P<qty>\d+(?:\.\d+)?|\d+/\d+|"
+        + "|".join(_WORD_QUANTITIES)
+        + r")\s+)?(?P<food>[a-z ]+?)"
+        r"(?:\s+(?:for|at|with|as)\s+(?:a\s+)?(?P<meal>breakfast|lunch|dinner|snack))?[.!]*$"
+    )
+    
+    def lookup(self, food_description: str) -> Optional[Dict[str, Any]]:
+        """
+        Analyze an entry that names one food from the local table.
+        
+        Args:
+            food_description: User's food description message
+        
+        Returns:
+            A fresh dict shaped like FoodAnalysis.model_dump(), or None if
+            the entry needs the model
+        """
+        match = self._ENTRY_RE.match(" ".join(food_description.lower().split()))
+        if match is None:
+            return None
+        food = match["food"]
+        if food in self.PLURALS:
+            if match["qty"] is None:
+                return None
+            food = self.PLURALS[food]
+        name = self.ALIASES.get(food, food)
+        if name not in self.FOODS:
+            return None
+        
+        qty_text = self._WORD_QUANTITIES.get(match["qty"], match["qty"]) or "1"
+        try:
+            quantity = Fraction(qty_text)
+        except ZeroDivisionError:
+            return None
+        if not 0 < quantity <= self.MAX_QUANTITY:
+            return None
+        
+        title, usual_meal_type, *per_unit, note = self.FOODS[name]
+        meal_type = match["meal"] or usual_meal_type
+        quantity = float(quantity)
+        nutrition = dict(zip(
+            ("calories", "protein", "carbs", "fats"),
+            (round(value * quantity, 1) for value in per_unit)
+        ))
+        return {
+            "meal_type": meal_type,
+            "items": [{
+                "normalized_title": title if quantity == 1 else f"{title} ({qty_text})",
+                "nutrition": nutrition,
+                "confidence_score": 0.9,
+                "notes": note
+            }],
+            "total_nutrition": dict(nutrition),
+            "notes": None
+        }
@@ -1,6 +1,6 @@
 """Service for classifying incoming messages as questions or food entries."""
 
-from typing import List
+import re
 
 
 class MessageClassificationService:
@@ -16,6 +16,14 @@ class MessageClassificationService:
         "recommend", "suggest", "advice", "help", "tell me"
     ]
     
+    # Question mark, leading question word, or indicator phrase in one scan
+    _QUESTION_RE = re.compile(
+        r"\?"
+        r"|^\s*(?:" + "|".join(QUESTION_KEYWORDS) + r")\b"
+        r"|\b(?:" + "|".join(QUESTION_INDICATORS) + r")",
+        re.IGNORECASE
+    )
+    
     def is_question(self, message: str) -> bool:
         """
         Determine if a message is a question based on keywords and patterns.
@@ -26,21 +34,7 @@ class MessageClassificationService:
         Returns:
             True if the message appears to be a question, False otherwise
         """
-        message_lower = message.lower().strip()
-        
-        # Check for question mark
-        if "?" in message:
-            return True
-            
-        # Check if message starts with question words
-        if any(message_lower.startswith(word) for word in self.QUESTION_KEYWORDS):
-            return True
-            
-        # Check for question indicators anywhere in the message
-        if any(indicator in message_lower for indicator in self.QUESTION_INDICATORS):
-            return True
-            
-        return False
+        return self._QUESTION_RE.search(message) is not None
     
     def classify_message(self, message: str) -> str:
         """
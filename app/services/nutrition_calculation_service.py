@@ -3,9 +3,9 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
 
 from app.models.food_log import FoodLog
+from app.repositories.food_log_repository import FoodLogRepository
 from app.schemas.nutrition import MacroNutrients
 from app.schemas.user import DailyProgress, NutritionProfile
 
@@ -30,24 +30,13 @@ class NutritionCalculationService:
         if date is None:
             date = datetime.now(timezone.utc).date()
             
-        stmt = select(
-            func.sum(FoodLog.calories).label('total_calories'),
-            func.sum(FoodLog.protein).label('total_protein'),
-            func.sum(FoodLog.carbs).label('total_carbs'),
-            func.sum(FoodLog.fats).label('total_fats')
-        ).where(
-            FoodLog.user_id == user_id,
-            func.date(FoodLog.created_at) == date
-        )
-        
-        result = await self.db.execute(stmt)
-        daily_totals = result.first()
-        
+        result = await self.db.execute(FoodLogRepository.daily_totals_stmt(user_id, date))
+        totals = result.one()
         return MacroNutrients(
-            calories=float(daily_totals.total_calories or 0),
-            protein=float(daily_totals.total_protein or 0),
-            carbs=float(daily_totals.total_carbs or 0),
-            fats=float(daily_totals.total_fats or 0)
+            calories=totals.total_calories,
+            protein=totals.total_protein,
+            carbs=totals.total_carbs,
+            fats=totals.total_fats
         )
     
     def calculate_meal_totals(self, food_logs: List[FoodLog]) -> MacroNutrients:
@@ -60,11 +49,18 @@ class NutritionCalculationService:
         Returns:
             MacroNutrients with meal totals
         """
+        calories = protein = carbs = fats = 0.0
+        for log in food_logs:
+            calories += log.calories
+            protein += log.protein
+            carbs += log.carbs
+            fats += log.fats
+        
         return MacroNutrients(
-            calories=sum(log.calories for log in food_logs),
-            protein=sum(log.protein for log in food_logs),
-            carbs=sum(log.carbs for log in food_logs),
-            fats=sum(log.fats for log in food_logs)
+            calories=calories,
+            protein=protein,
+            carbs=carbs,
+            fats=fats
         )
     
     def calculate_daily_progress(
@@ -82,14 +78,16 @@ class NutritionCalculationService:
         Returns:
             DailyProgress with consumed, targets, and remaining
         """
-        remaining = MacroNutrients(
-            calories=max(0, targets.calories - consumed.calories),
-            protein=max(0, targets.protein - consumed.protein),
-            carbs=max(0, targets.carbs - consumed.carbs),
-            fats=max(0, targets.fats - consumed.fats)
+        # Both inputs are validated models and max() keeps the differences
+        # non-negative, so skip re-validating the results
+        remaining = MacroNutrients.model_construct(
+            calories=max(0.0, targets.calories - consumed.calories),
+            protein=max(0.0, targets.protein - consumed.protein),
+            carbs=max(0.0, targets.carbs - consumed.carbs),
+            fats=max(0.0, targets.fats - consumed.fats)
         )
         
-        return DailyProgress(
+        return DailyProgress.model_construct(
             consumed=consumed,
             targets=targets,
             remaining=remaining
@@ -0,0 +1,71 @@
+import pytest
+
+from app.services.food_lookup_service import FoodLookupService
+from app.services.openai_service import FoodAnalysis
+
+
+@pytest.fixture
+def lookup():
+    return FoodLookupService().lookup
+
+
+@pytest.mark.parametrize("entry, title, calories", [
+    ("banana", "Banana", 105.0),
+    ("Banana.", "Banana", 105.0),
+    ("  a   banana ", "Banana", 105.0),
+    ("2 eggs", "Egg (2)", 144.0),
+    ("two large eggs", "Egg (2)", 144.0),
+    ("1/2 apple", "Apple (1/2)", 47.5),
+    ("half a peach", "Peach (1/2)", 29.5),
+    ("1.5 oranges", "Orange (1.5)", 93.0),
+    ("a cup of black coffee", "Black Coffee", 2.0),
+])
+def test_counted_foods(lookup, entry, title, calories):
+    analysis = lookup(entry)
+
+    assert analysis["items"][0]["normalized_title"] == title
+    assert analysis["total_nutrition"]["calories"] == calories
+    assert analysis["items"][0]["notes"]
+
+
+@pytest.mark.parametrize("entry, meal_type", [
+    ("banana", "snack"),
+    ("banana for breakfast", "breakfast"),
+    ("2 eggs for dinner", "dinner"),
+    ("an apple as a snack", "snack"),
+    ("coffee with lunch", "lunch"),
+    ("coffee", "drink"),
+])
+def test_meal_type_comes_from_the_entry(lookup, entry, meal_type):
+    assert lookup(entry)["meal_type"] == meal_type
+
+
+@pytest.mark.parametrize("entry", [
+    "chicken and rice",
+    "banana and an apple",
+    "coffee with milk",
+    "banana bread",
+    "for breakfast I had a banana",
+    "0 eggs",
+    "13 eggs",
+    "1/0 eggs",
+    "3 oz banana",
+    "eggs for breakfast",
+    "bananas",
+    "cups of coffee",
+    "",
+])
+def test_other_entries_go_to_the_model(lookup, entry):
+    assert lookup(entry) is None
+
+
+def test_result_is_a_valid_food_analysis(lookup):
+    analysis = lookup("2 eggs for breakfast")
+
+    assert FoodAnalysis.model_validate(analysis).model_dump() == analysis
+
+
+def test_results_are_independent(lookup):
+    lookup("banana")["items"][0]["nutrition"]["calories"] = 0
+
+    assert lookup("banana")["items"][0]["nutrition"]["calories"] == 105.0
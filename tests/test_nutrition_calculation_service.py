@@ -0,0 +1,36 @@
+import asyncio
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.models.user  # noqa: F401, registers the users table
+from app.db.base import Base
+from app.services.nutrition_calculation_service import NutritionCalculationService
+
+
+async def _daily_calories(created_at_values, day):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for calories, created_at in created_at_values:
+            # Stored as CURRENT_TIMESTAMP writes it
+            await conn.execute(
+                text("INSERT INTO food_logs (user_id, calories, created_at) VALUES (1, :calories, :created_at)"),
+                {"calories": calories, "created_at": created_at}
+            )
+    async with AsyncSession(engine) as db:
+        totals = await NutritionCalculationService(db).get_daily_totals(1, day)
+    await engine.dispose()
+    return totals.calories
+
+
+def test_daily_totals_include_midnight_and_exclude_the_next_midnight():
+    calories = asyncio.run(_daily_calories([
+        (100.0, "2024-05-01 23:59:59"),
+        (200.0, "2024-05-02 00:00:00"),
+        (300.0, "2024-05-02 23:59:59"),
+        (400.0, "2024-05-03 00:00:00"),
+    ], date(2024, 5, 2)))
+
+    assert calories == 500.0
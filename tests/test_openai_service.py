@@ -0,0 +1,76 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.openai_service import OpenAIService
+
+_REPLY = (
+    '{"meal_type": "lunch", "items": [{"normalized_title": "Chicken and Rice",'
+    ' "nutrition": {"calories": 600, "protein": 40, "carbs": 70, "fats": 12},'
+    ' "confidence_score": 0.8}],'
+    ' "total_nutrition": {"calories": 600, "protein": 40, "carbs": 70, "fats": 12}}'
+)
+
+
+@pytest.fixture
+def service():
+    """An OpenAIService whose completions take 0.1 s and are counted."""
+    service = OpenAIService()
+    service.requests = []
+
+    async def create(**kwargs):
+        service.requests.append(kwargs)
+        await asyncio.sleep(0.1)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=_REPLY))])
+
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return service
+
+
+def test_identical_entries_share_one_request(service):
+    async def run():
+        return await asyncio.gather(
+            service.analyze_food_entry("chicken rice"),
+            service.analyze_food_entry("  Chicken   rice ")
+        )
+
+    first, second = asyncio.run(run())
+
+    assert first == second
+    assert first is not second
+    assert len(service.requests) == 1
+
+
+def test_last_waiter_leaving_cancels_the_request(service):
+    async def run():
+        caller = asyncio.create_task(service.analyze_food_entry("chicken rice"))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.sleep(0.2)
+
+    asyncio.run(run())
+
+    assert not service._analysis_cache
+    assert not service._pending_analyses
+    assert not service._analysis_waiters
+
+
+def test_entry_arriving_during_a_cancellation_gets_its_own_request(service):
+    async def run():
+        first = asyncio.create_task(service.analyze_food_entry("chicken rice"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # Its request is cancelled but still unwinding when the next entry arrives
+        second = await service.analyze_food_entry("chicken rice")
+        # The cancelled request unwinding must not unlist the new one
+        assert not service._pending_analyses
+        return second
+
+    analysis = asyncio.run(run())
+
+    assert analysis["meal_type"] == "lunch"
+    assert len(service.requests) == 2
+    assert "chicken rice" in service._analysis_cache